@@ -1,50 +1,362 @@
 #!/usr/bin/env python3
 """
 Comprehensive Star Manipulation Detection Tool
-Usage: python3 final.py <owner> <repo>
+Usage: python3 final.py [--fast] [--clustering METHOD] [--max-stars N] [--max-commits N] <owner> <repo>
+       python3 final.py [options] --batch repos.txt
 """
+import argparse
+import hashlib
+import importlib.util
 import os
+import re
 import sys
-from collections import Counter, defaultdict
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from urllib.parse import parse_qs, urlparse
 
-import matplotlib
 import numpy as np
 import requests
-from scipy import stats
-from scipy.cluster.hierarchy import linkage, fcluster
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson is an optional, much faster JSON parser/encoder for API responses and the report
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
 import json
 from dotenv import load_dotenv
 
 load_dotenv()
+# Checked after argument parsing, so --help and usage errors work without a token
 TOKEN = os.getenv('GITHUB_TOKEN')
-if not TOKEN:
-    print("Error: GITHUB_TOKEN not found in .env file")
-    sys.exit(1)
 
 HEADERS = {"Authorization": f"token {TOKEN}"}
 STAR_HEADERS = {"Authorization": f"token {TOKEN}", "Accept": "application/vnd.github.v3.star+json"}
 
-def get_total_count_from_search(owner, repo, item_type):
-    """Get accurate total count using GitHub Search API"""
-    query = f"repo:{owner}/{repo} type:{item_type}"
-    url = "https://api.github.com/search/issues"
+# The API cache lives in the user cache dir so runs from any directory share it
+CACHE_DIR = os.path.join(os.getenv('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+                         'fake-star-detector')
+
+# Concurrent page fetches per endpoint, kept low for GitHub's secondary rate limits
+MAX_CONCURRENT_PAGES = 3
+# Independent endpoints (repo query, commits, stargazers) run side by side
+API_POOL = ThreadPoolExecutor(max_workers=3)
+# Cap on requests in flight across all endpoints and their page fetches together
+MAX_CONCURRENT_REQUESTS = 6
+REQUEST_SLOTS = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+MAX_RETRIES = 3
+# Below this many remaining requests, spread the rest of the quota until the reset
+RATE_LIMIT_THRESHOLD = 50
+
+# Default sample sizes for the paginated list endpoints (--max-commits / --max-stars).
+# The time-clustering thresholds (main cluster std < 5 / < 10 min over at most 8 clusters)
+# were tuned on a 100-star sample; larger samples put more points in each cluster and blur it.
+PAGE_SIZE = 100
+MAX_COMMITS = 500
+MAX_STARGAZERS = 100
+
+# Repository-metric evidence rules: evidence key -> tiers of (test, score), the first passing
+# tier wins. Tests read the rate metrics (percent of stars); rates mean little below 100 stars.
+EVIDENCE_RULES = {
+    'issue_rate': ((lambda m: m['stars'] > 100 and m['issue_rate'] < 1, 30),
+                   (lambda m: m['stars'] > 100 and m['issue_rate'] < 2, 15)),
+    'pr_rate': ((lambda m: m['stars'] > 100 and m['pr_rate'] < 1, 20),
+                (lambda m: m['stars'] > 100 and m['pr_rate'] < 2, 10)),
+    'fork_rate': ((lambda m: m['stars'] > 100 and m['fork_rate'] < 8, 25),),
+    'bot_commits': ((lambda m: m['bot_commit_ratio'] > 80 and m['commits'] > 50, 30),
+                    (lambda m: m['bot_commit_ratio'] > 50, 15)),
+}
+
+def score_evidence(name, metrics):
+    """Score one EVIDENCE_RULES entry against the metrics (0 when no tier matches)"""
+    return next((score for test, score in EVIDENCE_RULES[name] if test(metrics)), 0)
+
+# Repository evidence (issue/PR/fork/bot scores) at which --fast skips time clustering
+FAST_PATH_SCORE = 80
+
+# Commit-message signatures of activity-padding bots, matched in one regex scan.
+# Dependency bots (dependabot, renovate) are left out: they are normal on genuine projects.
+BOT_COMMIT_SIGNATURES = ('Update TIME.md',)
+BOT_COMMIT_RE = re.compile('|'.join(map(re.escape, BOT_COMMIT_SIGNATURES)))
+
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Repository metadata, issue/PR totals and the owner's most-starred repositories in one
+# round trip (replaces 1 REST + 2 Search calls and the paginated /users/{owner}/repos listing).
+# Only repositories above 50 stars feed the bulk-creation check, so the top 100 by stars suffice.
+# Public repositories only, as /users/{owner}/repos listed, even when the token sees private ones.
+REPO_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    stargazerCount
+    forkCount
+    issues { totalCount }
+    pullRequests { totalCount }
+  }
+  repositoryOwner(login: $owner) {
+    repositories(first: 100, ownerAffiliations: OWNER, privacy: PUBLIC,
+                 orderBy: {field: STARGAZERS, direction: DESC}) {
+      nodes { stargazerCount createdAt }
+    }
+  }
+}
+"""
+
+_session = None
+_session_lock = threading.Lock()
+
+def cache_key(request, **kwargs):
+    """requests-cache key that also tells tokens apart, so a response fetched with one token's
+    visibility is never served to another. requests-cache redacts Authorization from stored
+    requests and from its own key, so a digest of the header is appended instead."""
+    from requests_cache import create_key
+    token_digest = hashlib.sha256(request.headers.get('Authorization', '').encode()).hexdigest()
+    return create_key(request, **kwargs) + token_digest[:16]
+
+def get_session():
+    """Shared HTTP session, built on first request so --help and usage errors create no cache"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            # requests-cache keeps responses with their ETags on disk and revalidates them with
+            # If-None-Match once expired; GitHub answers unchanged resources with a 304 that costs
+            # no rate limit. Expiry comes from the settings here rather than GitHub's
+            # Cache-Control (max-age=60): an hour in general, while stargazer pages gain new
+            # stars constantly and are revalidated on every request. Only GETs are cached: the
+            # GraphQL POST (repository metadata and owner repositories) always goes to the API.
+            try:
+                import requests_cache
+                session = requests_cache.CachedSession(
+                    os.path.join(CACHE_DIR, 'github_cache'), backend='sqlite',
+                    expire_after=3600, match_headers=['Accept'], key_fn=cache_key,
+                    urls_expire_after={
+                        'api.github.com/repos/*/stargazers': requests_cache.EXPIRE_IMMEDIATELY})
+            except ImportError:
+                session = requests.Session()
+            # Keep one pooled keep-alive connection per in-flight request, and let urllib3 retry
+            # transient gateway errors (idempotent GETs only) with backoff
+            session.mount("https://", HTTPAdapter(
+                pool_connections=2, pool_maxsize=MAX_CONCURRENT_REQUESTS,
+                max_retries=Retry(total=MAX_RETRIES, backoff_factor=0.5,
+                                  status_forcelist=(502, 503, 504), raise_on_status=False)))
+            _session = session
+        return _session
+
+class RateLimitError(RuntimeError):
+    """The token's primary rate limit is used up until the reset time"""
+
+class RepositoryNotFound(LookupError):
+    """The repository does not exist or the token cannot see it"""
+
+class GitHubAPIError(RuntimeError):
+    """A GitHub API call failed for a reason other than a missing repository"""
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+def pace_rate_limit(r):
+    """Sleep only when the rate-limit budget runs low, spreading what is left until the reset"""
+    if getattr(r, 'from_cache', False):
+        return
+    remaining = r.headers.get('X-RateLimit-Remaining')
+    reset = r.headers.get('X-RateLimit-Reset')
+    # At zero there is nothing left to spread; the next call fails fast with RateLimitError
+    if remaining is None or reset is None or not 0 < int(remaining) < RATE_LIMIT_THRESHOLD:
+        return
+    time.sleep(max(0, (int(reset) - time.time()) / int(remaining)))
+
+def github_request(method, url, headers=HEADERS, **kwargs):
+    """Send a GitHub API request, waiting out Retry-After on secondary rate limits"""
+    for attempt in range(MAX_RETRIES + 1):
+        with REQUEST_SLOTS:
+            r = get_session().request(method, url, headers=headers, **kwargs)
+        retry_after = r.headers.get('Retry-After')
+        if r.status_code in (403, 429) and retry_after and attempt < MAX_RETRIES:
+            time.sleep(int(retry_after))
+            continue
+        # Primary limit exhausted: every further call would fail too, so stop instead of
+        # carrying on with empty data
+        if r.status_code in (403, 429) and r.headers.get('X-RateLimit-Remaining') == '0':
+            reset = datetime.fromtimestamp(int(r.headers.get('X-RateLimit-Reset', 0)))
+            raise RateLimitError(f"GitHub API rate limit exhausted, resets at {reset:%H:%M:%S}")
+        pace_rate_limit(r)
+        return r
+
+def response_json(r):
+    """Decode a response body as JSON, using orjson when it is installed"""
+    return orjson.loads(r.content) if orjson is not None else r.json()
+
+def github_get(url, headers=HEADERS, params=None):
+    """GET a GitHub REST API URL"""
+    return github_request('GET', url, headers=headers, params=params)
+
+def github_graphql(query, variables):
+    """Run a GitHub GraphQL query, returning its data dict; NOT_FOUND errors leave their field null"""
+    r = github_request('POST', GRAPHQL_URL, json={"query": query, "variables": variables})
+    if r.status_code != 200:
+        try:
+            detail = response_json(r).get('message', '')
+        except ValueError:
+            detail = ''
+        raise GitHubAPIError(f"GitHub GraphQL request failed ({r.status_code}) {detail}".rstrip(),
+                             status=r.status_code)
+    
+    body = response_json(r)
+    # GraphQL reports rate limits and permission problems as 200 responses with an errors list
+    errors = body.get('errors') or []
+    if any(e.get('type') == 'RATE_LIMITED' for e in errors):
+        raise RateLimitError("GitHub GraphQL rate limit exhausted")
+    other = [e for e in errors if e.get('type') != 'NOT_FOUND']
+    if other:
+        raise GitHubAPIError("GitHub GraphQL error: " + "; ".join(
+            f"{e.get('type', 'ERROR')}: {e.get('message', '')}" for e in other))
+    return body.get('data') or {}
+
+def write_json(path, data):
+    """Write data as indented JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+
+def fetch_all_pages(url, headers=HEADERS, params=None, max_items=MAX_COMMITS, cancel=None):
+    """Fetch up to max_items from a paginated list endpoint; pages 2..N are requested concurrently.
+    Once the optional cancel Event is set, no further pages are requested."""
+    cancelled = cancel.is_set if cancel is not None else lambda: False
+    per_page = min(PAGE_SIZE, max_items)
+    params = {**(params or {}), "per_page": per_page}
+    if cancelled():
+        return []
+    first = github_get(url, headers=headers, params=params)
+    if first.status_code != 200 or cancelled():
+        return []
+    
+    items = response_json(first)
+    last_url = first.links.get('last', {}).get('url')
+    if not last_url:
+        return items
+    last_page = min(int(parse_qs(urlparse(last_url).query)['page'][0]), -(-max_items // per_page))
+    
+    def fetch_page(page):
+        if cancelled():
+            return []
+        r = github_get(url, headers=headers, params={**params, "page": page})
+        # A missing page would join its neighbours into one long fake interval, so fail the
+        # fetch instead of returning a silently shortened sample
+        if r.status_code != 200:
+            raise GitHubAPIError(f"GitHub API request failed ({r.status_code}) for {url} page {page}",
+                                 status=r.status_code)
+        return response_json(r)
+    
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PAGES) as pool:
+        for page_items in pool.map(fetch_page, range(2, last_page + 1)):
+            items.extend(page_items)
+    # The last page requested may overshoot a cap that is not a multiple of the page size
+    return items[:max_items]
+
+def ward_clusters(intervals_min, max_clusters):
+    """Ward hierarchical clustering labels (1..max_clusters) -- the published default"""
+    # scipy is imported here rather than at startup, it is only needed once data is in
+    from scipy.cluster.hierarchy import fcluster
     
+    # fastcluster is an optional drop-in for scipy's linkage with an O(N) memory Ward
     try:
-        r = requests.get(url, headers=HEADERS, params={"q": query, "per_page": 1})
-        if r.status_code == 200:
-            return r.json().get('total_count', 0)
-        else:
-            return 0
-    except:
-        return 0
+        from fastcluster import linkage_vector as ward_linkage
+    except ImportError:
+        from scipy.cluster.hierarchy import linkage as ward_linkage
+    
+    X = intervals_min.reshape(-1, 1)
+    linkage_matrix = ward_linkage(X, method='ward')
+    return fcluster(linkage_matrix, t=max_clusters, criterion='maxclust')
+
+def kmeans1d_clusters(intervals_min, max_clusters):
+    """Optimal 1-D k-means labels in O(kN) via kmeans1d, numbered from 1 like fcluster"""
+    from kmeans1d import cluster
+    
+    labels, _ = cluster(intervals_min.tolist(), max_clusters)
+    return np.asarray(labels) + 1
+
+# Fine bins for the histogram method; the mode window is the peak bin plus its right neighbour
+HISTOGRAM_BINS = 50
+
+def histogram_clusters(intervals_min, max_clusters):
+    """Histogram-mode labels in O(N log N): 1 for the densest interval window, the rest binned"""
+    labels = np.ones(len(intervals_min), dtype=np.int64)
+    if max_clusters < 2:
+        return labels
+    
+    hist, edges = np.histogram(intervals_min, bins=HISTOGRAM_BINS)
+    peak = int(hist.argmax())
+    upper = edges[min(peak + 2, HISTOGRAM_BINS)]
+    in_mode = (intervals_min >= edges[peak]) & (intervals_min <= upper)
+    
+    # Everything outside the mode window goes to equal-width groups labelled 2..max_clusters
+    rest = intervals_min[~in_mode]
+    if len(rest):
+        rest_edges = np.histogram_bin_edges(rest, bins=max_clusters - 1)
+        labels[~in_mode] = np.digitize(rest, rest_edges[1:-1]) + 2
+    return labels
+
+# Density grid for the kde method, spanning the full range of log intervals
+KDE_GRID_POINTS = 512
+
+def kde_clusters(intervals_min, max_clusters):
+    """Gaussian-KDE mode labels on log intervals, split at the density minima between modes"""
+    from scipy.signal import find_peaks
+    from scipy.stats import gaussian_kde
+    
+    labels = np.ones(len(intervals_min), dtype=np.int64)
+    # Intervals span seconds to days: on a linear scale the organic tail inflates the bandwidth
+    # until a tight bot mode is smeared into its neighbours. In log space both keep their shape.
+    # Zero gaps (same-second stars) are floored at one second.
+    log_intervals = np.log(np.maximum(intervals_min, 1 / 60))
+    # A constant sample has no density to estimate (singular covariance): one cluster
+    if max_clusters < 2 or np.ptp(log_intervals) == 0:
+        return labels
+    
+    xs = np.linspace(log_intervals.min(), log_intervals.max(), KDE_GRID_POINTS)
+    density = gaussian_kde(log_intervals)(xs)
+    peaks, _ = find_peaks(density)
+    if len(peaks) < 2:
+        return labels
+    
+    # Keep the tallest max_clusters modes; neighbouring modes are separated at the lowest
+    # density between them, so each cluster is one mode's basin rather than a distance cut
+    modes = np.sort(peaks[np.argsort(density[peaks])[::-1][:max_clusters]])
+    cuts = [xs[left + density[left:right + 1].argmin()] for left, right in zip(modes[:-1], modes[1:])]
+    return np.searchsorted(cuts, log_intervals) + 1
+
+# --clustering choices: name -> (label function, optional module it needs, plot title)
+CLUSTERING_METHODS = {
+    'ward': (ward_clusters, None, 'Hierarchical Clustering'),
+    'kmeans1d': (kmeans1d_clusters, 'kmeans1d', '1-D K-Means Clustering'),
+    'histogram': (histogram_clusters, None, 'Histogram Mode Clustering'),
+    'kde': (kde_clusters, None, 'KDE Mode Clustering'),
+}
+
+def cluster_intervals(intervals_min, method='ward'):
+    """Cluster the 1-D star intervals; returns (labels, max_clusters)"""
+    max_clusters = min(8, len(intervals_min) // 10)
+    cluster_fn = CLUSTERING_METHODS[method][0]
+    return cluster_fn(intervals_min, max_clusters), max_clusters
+
+# Upper bound on markers drawn per cluster in the cluster panel
+MAX_SCATTER_POINTS = 500
 
 def create_visualization(owner, repo, report_data, stargazers_data, intervals_min, times, clusters, max_clusters):
-    """Create 4-panel visualization"""
-    print(f"\n[7/8] Creating visualization...")
+    """Create 4-panel visualization, returning the saved file name"""
+    # matplotlib is the slowest import by far, so only load it when a figure is drawn.
+    # A bare Figure (no pyplot state machine) is safe to render on a worker thread.
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.lines import Line2D
     
     metrics = report_data['metrics']
     main_cluster = metrics.get('main_cluster', {})
@@ -59,13 +371,15 @@ def create_visualization(owner, repo, report_data, stargazers_data, intervals_mi
     total_count = len(intervals_min)
     in_range_pct = in_range_count / total_count * 100
     
-    # Create figure
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    # Create figure: three plot axes on a 2x2 grid; the metrics panel is plain figure text,
+    # so no Axes (ticks, spines, transforms) is built just to hold it
+    fig = Figure(figsize=(14, 10), layout='constrained')
+    grid = fig.add_gridspec(2, 2)
     fig.suptitle(f'Star Manipulation Evidence - {owner}/{repo}', 
                  fontsize=16, fontweight='bold')
     
     # Plot 1: Interval Distribution (< 500 min only)
-    ax1 = axes[0, 0]
+    ax1 = fig.add_subplot(grid[0, 0])
     ax1.hist(intervals_filtered, bins=30, color='steelblue', edgecolor='black', alpha=0.7)
     ax1.axvline(main_cluster['mean'], color='red', linestyle='--', linewidth=2,
                label=f"Main cluster: {main_cluster['mean']:.1f} min")
@@ -76,39 +390,47 @@ def create_visualization(owner, repo, report_data, stargazers_data, intervals_mi
     ax1.grid(True, alpha=0.3)
     
     # Plot 2: Cluster Visualization (sorted by size)
-    ax2 = axes[0, 1]
-    
-    # Get cluster info and sort by count
-    cluster_sizes = []
-    for cluster_id in range(1, max_clusters + 1):
-        cluster_data = intervals_min[clusters == cluster_id]
-        if len(cluster_data) > 0:
-            cluster_sizes.append((cluster_id, len(cluster_data)))
+    ax2 = fig.add_subplot(grid[0, 1])
+    
+    # Get cluster sizes and sort by count
+    sizes = np.bincount(clusters, minlength=max_clusters + 1)
+    cluster_sizes = [(cid, int(sizes[cid])) for cid in range(1, max_clusters + 1) if sizes[cid] > 0]
     cluster_sizes.sort(key=lambda x: x[1], reverse=True)
     
-    # Create position mapping
-    position_map = {cid: pos for pos, (cid, _) in enumerate(cluster_sizes, 1)}
+    # Position lookup indexed by cluster id, so all points go into one scatter call
+    positions = np.zeros(max_clusters + 1, dtype=int)
+    for pos, (cid, _) in enumerate(cluster_sizes, 1):
+        positions[cid] = pos
     
-    colors = plt.cm.Set3(np.linspace(0, 1, max_clusters))
-    for cluster_id, count in cluster_sizes:
-        cluster_data = intervals_min[clusters == cluster_id]
-        pos = position_map[cluster_id]
-        ax2.scatter([pos] * len(cluster_data), cluster_data, 
-                   c=[colors[cluster_id-1]], alpha=0.6, s=50,
-                   label=f'C{cluster_id} (n={count})')
+    colors = matplotlib.colormaps['Set3'](np.linspace(0, 1, max_clusters))
+    # Overlapping markers add render cost but no information: draw a seeded sample of at
+    # most MAX_SCATTER_POINTS per cluster (legend counts still use the full cluster sizes)
+    shown = np.arange(len(clusters))
+    if sizes.max() > MAX_SCATTER_POINTS:
+        rng = np.random.default_rng(0)
+        members = (np.flatnonzero(clusters == cid) for cid, _ in cluster_sizes)
+        shown = np.concatenate([idx if len(idx) <= MAX_SCATTER_POINTS
+                                else rng.choice(idx, MAX_SCATTER_POINTS, replace=False)
+                                for idx in members])
+    ax2.scatter(positions[clusters[shown]], intervals_min[shown], c=colors[clusters[shown] - 1],
+                alpha=0.6, s=50)
     
     ax2.set_xlabel('Cluster (sorted by size)')
     ax2.set_ylabel('Interval (minutes)')
-    ax2.set_title('Hierarchical Clustering Results (by size)')
+    method_title = CLUSTERING_METHODS[metrics.get('clustering_method', 'ward')][2]
+    ax2.set_title(f'{method_title} Results (by size)')
     ax2.grid(True, alpha=0.3)
     if len(cluster_sizes) <= 5:
-        ax2.legend(fontsize=8, loc='upper right')
+        handles = [Line2D([], [], marker='o', linestyle='', color=colors[cid - 1], alpha=0.6,
+                          label=f'C{cid} (n={count})')
+                   for cid, count in cluster_sizes]
+        ax2.legend(handles=handles, fontsize=8, loc='upper right')
     
     # Plot 3: Time of Day Distribution
-    ax3 = axes[1, 0]
-    hours = [t.hour for t in times]
-    hour_counts = Counter(hours)
-    ax3.bar(hour_counts.keys(), hour_counts.values(), color='coral', edgecolor='black')
+    ax3 = fig.add_subplot(grid[1, 0])
+    hours = times.astype('datetime64[h]').astype(np.int64) % 24
+    hour_counts = np.bincount(hours, minlength=24)
+    ax3.bar(range(24), hour_counts, color='coral', edgecolor='black')
     ax3.set_xlabel('Hour of Day')
     ax3.set_ylabel('Number of Stars')
     ax3.set_title('Star Distribution by Hour')
@@ -116,9 +438,6 @@ def create_visualization(owner, repo, report_data, stargazers_data, intervals_mi
     ax3.grid(True, alpha=0.3, axis='y')
     
     # Plot 4: Key Metrics
-    ax4 = axes[1, 1]
-    ax4.axis('off')
-    
     # Determine status indicators
     issue_status = "Suspicious: < 1%" if metrics['issue_rate'] < 1 else "OK"
     pr_status = "Suspicious: < 1%" if metrics['pr_rate'] < 1 else "OK"
@@ -156,23 +475,22 @@ Time Pattern Analysis:
 Suspicion Score: {report_data['suspicion_score']}/{report_data['max_score']}
     """
     
-    ax4.text(0.1, 0.5, metrics_text, fontsize=11, family='monospace',
-            verticalalignment='center')
-    
-    plt.tight_layout()
+    # Placed in the empty lower-right grid cell
+    fig.text(0.59, 0.25, metrics_text, fontsize=11, family='monospace',
+             verticalalignment='center')
     
     output_file = f"visualization_{owner}_{repo}.png"
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    print(f"   ✓ Saved: {output_file}")
-    plt.close()
+    # Fast zlib level: the PNG comes out ~15% larger but encodes quicker than the default 6
+    fig.savefig(output_file, dpi=150, pil_kwargs={'compress_level': 1})
+    return output_file
 
-def generate_verdict(owner, repo, report_data):
-    """Generate detailed verdict markdown file"""
-    print(f"\n[8/8] Generating verdict document...")
-    
+def verdict_sections(owner, repo, report_data):
+    """Yield the verdict markdown section by section"""
     metrics = report_data['metrics']
     evidence = report_data['evidence_scores']
     total_score = report_data['suspicion_score']
+    # Same timestamp as the JSON report, formatted like the console banner
+    analysis_time = report_data['analysis_date'][:19].replace('T', ' ')
     
     # Determine verdict level
     if total_score >= 100:
@@ -188,9 +506,36 @@ def generate_verdict(owner, repo, report_data):
         verdict_level = "🟢 LOW SUSPICION"
         confidence = "低"
     
-    verdict_md = f"""# 分析报告 - {owner}/{repo}
+    # Status flags for the basic-data table
+    fork_flag = '🔴' if metrics['fork_rate'] < 8 else '🟢'
+    issue_flag = '🔴' if metrics['issue_rate'] < 2 else '🟢'
+    pr_flag = '🔴' if metrics['pr_rate'] < 2 else '🟢'
+    bot_flag = '🔴' if metrics['bot_commit_ratio'] > 50 else '🟢'
+    
+    # Evidence judgments and explanations, resolved once so the templates below only substitute
+    issue_judgment = '🔴 异常 - Issue率过低' if evidence['issue_rate'] > 0 else '🟢 正常'
+    issue_note = ('**说明**: Issue率<1%说明用户只收藏不使用，典型的虚假star特征。' if evidence['issue_rate'] >= 30 else
+                  '**说明**: Issue率正常，用户有真实反馈。' if evidence['issue_rate'] == 0 else
+                  '**说明**: Issue率略低，需关注。')
+    pr_judgment = '🔴 异常 - PR率过低' if evidence['pr_rate'] > 0 else '🟢 正常'
+    pr_note = ('**说明**: 几乎无PR说明项目无人贡献，缺乏真实用户参与。' if evidence['pr_rate'] >= 20 else
+               '**说明**: PR率正常，项目有贡献者。' if evidence['pr_rate'] == 0 else
+               '**说明**: PR率略低。')
+    fork_judgment = '🔴 异常 - Fork率过低' if evidence['fork_rate'] > 0 else '🟢 正常'
+    fork_note = ('**说明**: Fork率<8%说明用户不实际使用项目，只是收藏。' if evidence['fork_rate'] > 0 else
+                 '**说明**: Fork率正常，用户真实使用项目。')
+    bot_judgment = ('🔴 严重异常 - Bot刷活跃度' if evidence['bot_commits'] >= 30 else
+                    '🟡 轻度异常' if evidence['bot_commits'] > 0 else '🟢 正常')
+    bot_note = ('**说明**: Bot提交占比>80%，明显用于刷活跃度和trending排名。' if evidence['bot_commits'] >= 30 else
+                '**说明**: 无Bot提交，提交记录真实。' if evidence['bot_commits'] == 0 else
+                '**说明**: 少量Bot提交。')
+    cluster_judgment = ('🔴 极度异常 - 程序自动化' if evidence['time_clustering'] >= 50 else
+                        '🟡 轻度异常' if evidence['time_clustering'] > 0 else '🟢 正常')
+    bulk_judgment = '🔴 异常 - 发现批量创建' if evidence['bulk_creation'] > 0 else '🟢 正常'
+    
+    yield f"""# 分析报告 - {owner}/{repo}
 
-> **生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+> **生成时间**: {analysis_time}
 
 ---
 
@@ -209,10 +554,10 @@ def generate_verdict(owner, repo, report_data):
 | 指标 | 数值 | 状态 |
 |------|------|------|
 | Stars | {metrics['stars']} | - |
-| Forks | {metrics['forks']} ({metrics['fork_rate']:.1f}%) | {'🔴' if metrics['fork_rate'] < 8 else '🟢'} |
-| Issues | {metrics['total_issues']} ({metrics['issue_rate']:.2f}%) | {'🔴' if metrics['issue_rate'] < 2 else '🟢'} |
-| PRs | {metrics['total_prs']} ({metrics['pr_rate']:.2f}%) | {'🔴' if metrics['pr_rate'] < 2 else '🟢'} |
-| Bot Commits | {metrics['bot_commit_ratio']:.0f}% | {'🔴' if metrics['bot_commit_ratio'] > 50 else '🟢'} |
+| Forks | {metrics['forks']} ({metrics['fork_rate']:.1f}%) | {fork_flag} |
+| Issues | {metrics['total_issues']} ({metrics['issue_rate']:.2f}%) | {issue_flag} |
+| PRs | {metrics['total_prs']} ({metrics['pr_rate']:.2f}%) | {pr_flag} |
+| Bot Commits | {metrics['bot_commit_ratio']:.0f}% | {bot_flag} |
 
 ---
 
@@ -222,33 +567,33 @@ def generate_verdict(owner, repo, report_data):
 
 - **实际值**: {metrics['issue_rate']:.2f}%
 - **正常值**: >2%
-- **判定**: {'🔴 异常 - Issue率过低' if evidence['issue_rate'] > 0 else '🟢 正常'}
+- **判定**: {issue_judgment}
 
-{'**说明**: Issue率<1%说明用户只收藏不使用，典型的虚假star特征。' if evidence['issue_rate'] >= 30 else '**说明**: Issue率正常，用户有真实反馈。' if evidence['issue_rate'] == 0 else '**说明**: Issue率略低，需关注。'}
+{issue_note}
 
 ### 2. PR率分析 ({evidence['pr_rate']} 分)
 
 - **实际值**: {metrics['pr_rate']:.2f}%
 - **正常值**: >2%
-- **判定**: {'🔴 异常 - PR率过低' if evidence['pr_rate'] > 0 else '🟢 正常'}
+- **判定**: {pr_judgment}
 
-{'**说明**: 几乎无PR说明项目无人贡献，缺乏真实用户参与。' if evidence['pr_rate'] >= 20 else '**说明**: PR率正常，项目有贡献者。' if evidence['pr_rate'] == 0 else '**说明**: PR率略低。'}
+{pr_note}
 
 ### 3. Fork率分析 ({evidence['fork_rate']} 分)
 
 - **实际值**: {metrics['fork_rate']:.1f}%
 - **正常值**: >8%
-- **判定**: {'🔴 异常 - Fork率过低' if evidence['fork_rate'] > 0 else '🟢 正常'}
+- **判定**: {fork_judgment}
 
-{'**说明**: Fork率<8%说明用户不实际使用项目，只是收藏。' if evidence['fork_rate'] > 0 else '**说明**: Fork率正常，用户真实使用项目。'}
+{fork_note}
 
 ### 4. Bot提交分析 ({evidence['bot_commits']} 分)
 
 - **实际值**: {metrics['bot_commit_ratio']:.0f}%
 - **正常值**: <20%
-- **判定**: {'🔴 严重异常 - Bot刷活跃度' if evidence['bot_commits'] >= 30 else '🟡 轻度异常' if evidence['bot_commits'] > 0 else '🟢 正常'}
+- **判定**: {bot_judgment}
 
-{'**说明**: Bot提交占比>80%，明显用于刷活跃度和trending排名。' if evidence['bot_commits'] >= 30 else '**说明**: 无Bot提交，提交记录真实。' if evidence['bot_commits'] == 0 else '**说明**: 少量Bot提交。'}
+{bot_note}
 
 ### 5. 时间聚类分析 ({evidence['time_clustering']} 分) ⭐ 核心证据
 
@@ -256,37 +601,46 @@ def generate_verdict(owner, repo, report_data):
 
     if 'main_cluster' in metrics and metrics['main_cluster']:
         cluster = metrics['main_cluster']
-        verdict_md += f"""
+        cluster_note = (f"**关键发现**: 标准差<5分钟，{int(cluster['percentage'])}%的star高度集中！这在统计学上不可能是人类行为，明确指向程序自动化控制。"
+                        if evidence['time_clustering'] >= 50 else
+                        '**说明**: 时间分布正常，符合人类行为模式。' if evidence['time_clustering'] == 0 else
+                        '**说明**: 存在一定规律性。')
+        yield f"""
 - **主簇大小**: {cluster['count']} 样本 ({cluster['percentage']:.1f}%)
 - **平均间隔**: {cluster['mean']:.1f} 分钟
 - **标准差**: {cluster['std']:.1f} 分钟
-- **判定**: {'🔴 极度异常 - 程序自动化' if evidence['time_clustering'] >= 50 else '🟡 轻度异常' if evidence['time_clustering'] > 0 else '🟢 正常'}
+- **判定**: {cluster_judgment}
 """
         
         # Add Chi-Square Test results if available
         if 'chi2_p_value' in cluster:
-            verdict_md += f"""
+            chi2_significance = ('🔴 高度显著 (p<0.01) - 数据显著集中，远超随机水平' if cluster['chi2_p_value'] < 0.01 else
+                                 '🟡 显著 (p<0.05) - 数据呈现集中性' if cluster['chi2_p_value'] < 0.05 else
+                                 '🟢 数据符合随机分布')
+            yield f"""
 #### 卡方方差检验 (Chi-Square Test for Variance)
 - **实际标准差**: {cluster['std']:.2f} 分钟
 - **期望标准差** (随机基准): {cluster['expected_std']:.2f} 分钟
 - **χ²统计量**: {cluster['chi2_stat']:.2f}
 - **p值**: {cluster['chi2_p_value']:.4f}
-- **统计意义**: {'🔴 高度显著 (p<0.01) - 数据显著集中，远超随机水平' if cluster['chi2_p_value'] < 0.01 else '🟡 显著 (p<0.05) - 数据呈现集中性' if cluster['chi2_p_value'] < 0.05 else '🟢 数据符合随机分布'}
+- **统计意义**: {chi2_significance}
 
 **检验说明**: 对于随机的时间间隔，标准差应≈均值（指数分布特征）。此检验判断数据是否比随机状态更集中。
 
 """
         
-        verdict_md += f"""
-{'**关键发现**: 标准差<5分钟，' + str(int(cluster['percentage'])) + '%的star高度集中！这在统计学上不可能是人类行为，明确指向程序自动化控制。' if evidence['time_clustering'] >= 50 else '**说明**: 时间分布正常，符合人类行为模式。' if evidence['time_clustering'] == 0 else '**说明**: 存在一定规律性。'}
+        yield f"""
+{cluster_note}
 """
+    elif metrics.get('clustering_skipped'):
+        yield "\n已跳过（--fast）：仓库指标已足够确定，未进行时间聚类分析。\n"
     else:
-        verdict_md += "\n数据不足，无法进行聚类分析。\n"
+        yield "\n数据不足，无法进行聚类分析。\n"
 
-    verdict_md += f"""
+    yield f"""
 ### 6. 批量创建分析 ({evidence['bulk_creation']} 分)
 
-- **判定**: {'🔴 异常 - 发现批量创建' if evidence['bulk_creation'] > 0 else '🟢 正常'}
+- **判定**: {bulk_judgment}
 
 ---
 
@@ -295,7 +649,7 @@ def generate_verdict(owner, repo, report_data):
 """
 
     if total_score >= 100:
-        verdict_md += f"""
+        yield f"""
 ### ⚠️  确认存在Star操纵行为
 
 基于多维度证据分析，该仓库存在**明确的Star操纵行为**。
@@ -305,17 +659,17 @@ def generate_verdict(owner, repo, report_data):
 - 提供本分析报告作为证据
 """
     elif total_score >= 60:
-        verdict_md += "### ⚠️  高度可疑\n\n该仓库存在多个异常指标。\n"
+        yield "### ⚠️  高度可疑\n\n该仓库存在多个异常指标。\n"
     elif total_score >= 30:
-        verdict_md += "### ⚠️  中度可疑\n\n存在部分异常指标。\n"
+        yield "### ⚠️  中度可疑\n\n存在部分异常指标。\n"
     else:
-        verdict_md += "### ✅ 正常项目\n\n各项指标均在正常范围内。\n"
+        yield "### ✅ 正常项目\n\n各项指标均在正常范围内。\n"
 
-    verdict_md += f"""
+    yield f"""
 ---
 
 **生成工具**: https://github.com/zly2006/fake-star-detector# v2.0  
-**分析时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  
+**分析时间**: {analysis_time}  
 **报告格式**: Markdown
 
 ---
@@ -326,36 +680,71 @@ def generate_verdict(owner, repo, report_data):
 - 可视化图表: ![visualization](visualization_{owner}_{repo}.png)
 """
 
+def generate_verdict(owner, repo, report_data):
+    """Generate detailed verdict markdown file"""
+    print(f"\n[8/8] Generating verdict document...")
+    
+    # Sections are written as they are produced; the full document is never held in memory
     output_file = f"verdict_{owner}_{repo}.md"
     with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(verdict_md)
+        f.writelines(verdict_sections(owner, repo, report_data))
     
     print(f"   ✓ Saved: {output_file}")
 
-def analyze_repository(owner, repo):
-    """Main analysis function"""
+def analyze_repository(owner, repo, fast=False, clustering='ward',
+                       max_stars=MAX_STARGAZERS, max_commits=MAX_COMMITS):
+    """Main analysis function; returns the report dict"""
+    # Taken per repository, so each report in a batch carries its own analysis time
+    run_ts = datetime.now()
     
     print("="*70)
     print("🔍 COMPREHENSIVE STAR MANIPULATION DETECTION")
     print("="*70)
     print(f"\nTarget: {owner}/{repo}")
-    print(f"Analysis Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    print(f"Analysis Date: {run_ts:%Y-%m-%d %H:%M:%S}\n")
+    
+    # The API calls are independent, so start them all now and consume results in order.
+    # With --fast the stargazers are only fetched once the repo evidence is known.
+    # If any fetch fails, the others are abandoned so they do not hold up the next
+    # repository of a batch.
+    abandon = threading.Event()
+    repo_api = f"https://api.github.com/repos/{owner}/{repo}"
+    repo_future = API_POOL.submit(github_graphql, REPO_QUERY, {"owner": owner, "name": repo})
+    commits_future = API_POOL.submit(fetch_all_pages, f"{repo_api}/commits",
+                                     max_items=max_commits, cancel=abandon)
+    stargazers_future = None if fast else API_POOL.submit(
+        fetch_all_pages, f"{repo_api}/stargazers", headers=STAR_HEADERS,
+        max_items=max_stars, cancel=abandon)
+    
+    def abandon_fetches():
+        abandon.set()
+        for pending in (commits_future, stargazers_future):
+            if pending is not None:
+                pending.cancel()
+    
+    def fetch_result(future):
+        """Wait for one fetch; if it fails, stop the pending ones before re-raising"""
+        try:
+            return future.result()
+        except BaseException:
+            abandon_fetches()
+            raise
     
     # Get repository data
     print("[1/6] Fetching repository data...")
-    repo_r = requests.get(f"https://api.github.com/repos/{owner}/{repo}", headers=HEADERS)
-    if repo_r.status_code != 200:
-        print(f"❌ Error: Repository not found ({repo_r.status_code})")
-        sys.exit(1)
+    repo_result = fetch_result(repo_future)
+    repo_data = repo_result.get('repository')
+    if not repo_data:
+        abandon_fetches()
+        raise RepositoryNotFound(f"Repository not found: {owner}/{repo}")
     
-    repo_data = repo_r.json()
-    stars = repo_data['stargazers_count']
-    forks = repo_data['forks_count']
+    stars = repo_data['stargazerCount']
+    forks = repo_data['forkCount']
     
-    # Get counts via Search API
-    print("[2/6] Fetching issues and PRs...")
-    total_issues = get_total_count_from_search(owner, repo, 'issue')
-    total_prs = get_total_count_from_search(owner, repo, 'pr')
+    # Issue and PR totals come from the same GraphQL query (all states)
+    print("[2/6] Computing issue and PR rates...")
+    total_issues = repo_data['issues']['totalCount']
+    total_prs = repo_data['pullRequests']['totalCount']
     
     issue_rate = total_issues / stars * 100 if stars > 0 else 0
     pr_rate = total_prs / stars * 100 if stars > 0 else 0
@@ -367,9 +756,10 @@ def analyze_repository(owner, repo):
     print(f"   ✓ PRs: {total_prs} ({pr_rate:.2f}%)")
     
     # Evidence scoring
-    evidence_1_score = 30 if issue_rate < 1 and stars > 100 else (15 if issue_rate < 2 and stars > 100 else 0)
-    evidence_2_score = 20 if pr_rate < 1 and stars > 100 else (10 if pr_rate < 2 and stars > 100 else 0)
-    evidence_3_score = 25 if fork_rate < 8 and stars > 100 else 0
+    rule_metrics = {'stars': stars, 'issue_rate': issue_rate, 'pr_rate': pr_rate, 'fork_rate': fork_rate}
+    evidence_1_score = score_evidence('issue_rate', rule_metrics)
+    evidence_2_score = score_evidence('pr_rate', rule_metrics)
+    evidence_3_score = score_evidence('fork_rate', rule_metrics)
     
     if evidence_1_score >= 30: print(f"   🔴 ANOMALY: Issue rate < 1%")
     if evidence_2_score >= 20: print(f"   🔴 ANOMALY: PR rate < 1%")
@@ -377,22 +767,34 @@ def analyze_repository(owner, repo):
     
     # Commits
     print(f"\n[3/6] Analyzing commits...")
-    commits_r = requests.get(f"https://api.github.com/repos/{owner}/{repo}/commits",
-                            headers=HEADERS, params={"per_page": 100})
-    commits = commits_r.json() if commits_r.status_code == 200 else []
-    bot_commits = sum(1 for c in commits if 'Update TIME.md' in c.get('commit', {}).get('message', ''))
+    commits = fetch_result(commits_future)
+    messages = [c.get('commit', {}).get('message', '') for c in commits]
+    # A lone signature is fastest as a plain substring test; several go through one regex scan
+    if len(BOT_COMMIT_SIGNATURES) == 1:
+        signature = BOT_COMMIT_SIGNATURES[0]
+        bot_commits = sum(1 for m in messages if signature in m)
+    else:
+        bot_commits = sum(1 for m in messages if BOT_COMMIT_RE.search(m))
     bot_ratio = bot_commits / len(commits) * 100 if commits else 0
     
     print(f"   ✓ Commits: {len(commits)}, Bot: {bot_commits} ({bot_ratio:.0f}%)")
     
-    evidence_4_score = 30 if bot_ratio > 80 and len(commits) > 50 else (15 if bot_ratio > 50 else 0)
+    rule_metrics.update(bot_commit_ratio=bot_ratio, commits=len(commits))
+    evidence_4_score = score_evidence('bot_commits', rule_metrics)
     if evidence_4_score >= 30: print(f"   🔴 ANOMALY: Bot commits > 80%")
     
     # Clustering
     print(f"\n[4/6] Time clustering analysis...")
-    stargazers_r = requests.get(f"https://api.github.com/repos/{owner}/{repo}/stargazers",
-                                headers=STAR_HEADERS, params={"per_page": 100})
-    stargazers = stargazers_r.json() if stargazers_r.status_code == 200 else []
+    # --fast: repository evidence alone is already conclusive, skip stargazers and plotting
+    repo_evidence_score = evidence_1_score + evidence_2_score + evidence_3_score + evidence_4_score
+    skip_clustering = fast and repo_evidence_score >= FAST_PATH_SCORE
+    if skip_clustering:
+        stargazers = []
+    elif stargazers_future is not None:
+        stargazers = fetch_result(stargazers_future)
+    else:
+        stargazers = fetch_all_pages(f"{repo_api}/stargazers", headers=STAR_HEADERS,
+                                     max_items=max_stars)
     
     evidence_5_score = 0
     evidence_7_score = 0  # ANOVA score
@@ -403,28 +805,26 @@ def analyze_repository(owner, repo):
     max_clusters = 0
     
     if len(stargazers) >= 20:
-        times = sorted([datetime.strptime(s['starred_at'], '%Y-%m-%dT%H:%M:%SZ') for s in stargazers])
-        intervals = np.array([(times[i] - times[i-1]).total_seconds() for i in range(1, len(times))])
-        intervals_min = intervals / 60
-        
-        X = intervals_min.reshape(-1, 1)
-        linkage_matrix = linkage(X, method='ward')
-        max_clusters = min(8, len(intervals) // 10)
-        clusters = fcluster(linkage_matrix, t=max_clusters, criterion='maxclust')
+        # starred_at is UTC ISO-8601; drop the 'Z' so numpy parses it without a timezone warning
+        times = np.array([s['starred_at'].rstrip('Z') for s in stargazers], dtype='datetime64[s]')
+        times.sort()
+        # One float64 buffer from the diff, converted to minutes in place
+        intervals_min = np.diff(times).astype(np.float64)
+        intervals_min /= 60.0
         
-        cluster_info = {}
-        for cid in range(1, max_clusters + 1):
-            cluster_data = intervals_min[clusters == cid]
-            if len(cluster_data) > 0:
-                cluster_info[cid] = {
-                    'count': len(cluster_data),
-                    'mean': float(np.mean(cluster_data)),
-                    'std': float(np.std(cluster_data)),
-                    'percentage': len(cluster_data) / len(intervals) * 100
-                }
+        clusters, max_clusters = cluster_intervals(intervals_min, clustering)
         
-        sorted_clusters = sorted(cluster_info.items(), key=lambda x: x[1]['count'], reverse=True)
-        main_cluster_info = sorted_clusters[0][1]
+        # Only the largest cluster is reported: find it from one bincount over the labels
+        # (argmax keeps the lowest label on ties), then take mean/std of its members alone
+        counts = np.bincount(clusters, minlength=max_clusters + 1)
+        main_cluster_id = int(counts.argmax())
+        main_cluster_data = intervals_min[clusters == main_cluster_id]
+        main_cluster_info = {
+            'count': int(counts[main_cluster_id]),
+            'mean': float(main_cluster_data.mean()),
+            'std': float(main_cluster_data.std()),
+            'percentage': float(counts[main_cluster_id] / len(intervals_min) * 100)
+        }
         
         print(f"   ✓ Main cluster: {main_cluster_info['count']} samples, std={main_cluster_info['std']:.1f}min")
         
@@ -434,9 +834,9 @@ def analyze_repository(owner, repo):
         elif main_cluster_info['std'] < 10 and main_cluster_info['percentage'] > 30:
             evidence_5_score = 25
         
-        # Chi-Square Test for Variance: Test if data is more concentrated than random
-        main_cluster_id = sorted_clusters[0][0]
-        main_cluster_data = intervals_min[clusters == main_cluster_id]
+        # Chi-Square Test for Variance: Test if data is more concentrated than random.
+        # scipy.special's chi-square CDF avoids importing all of scipy.stats (~0.4 s) for one call
+        from scipy.special import chdtr
         
         n = len(main_cluster_data)
         sample_std = main_cluster_info['std']
@@ -451,7 +851,7 @@ def analyze_repository(owner, repo):
         chi2_stat = (n - 1) * (sample_std ** 2) / (sigma_0 ** 2)
         
         # P-value for left-tailed test (we want to know if variance is smaller)
-        p_value = stats.chi2.cdf(chi2_stat, df=n-1)
+        p_value = chdtr(n - 1, chi2_stat)
         
         print(f"   ✓ Chi-Square Test: χ²={chi2_stat:.2f}, p={p_value:.4f}")
         
@@ -471,22 +871,25 @@ def analyze_repository(owner, repo):
             print(f"   🟡 MODERATE: Data shows concentration (p<0.05)")
         else:
             print(f"   🟢 Data concentration not significant")
+    elif skip_clustering:
+        print(f"   ⏩ Skipped (--fast): repository evidence already scores {repo_evidence_score}")
     else:
         print(f"   ⚠️  Insufficient data")
     
     # Bulk creation
     print(f"\n[5/6] Checking patterns...")
-    user_repos_r = requests.get(f"https://api.github.com/users/{owner}/repos",
-                                headers=HEADERS, params={"per_page": 100})
-    all_repos = user_repos_r.json() if user_repos_r.status_code == 200 else []
+    all_repos = ((repo_result.get('repositoryOwner') or {}).get('repositories') or {}).get('nodes', [])
     
-    high_star_repos = [r for r in all_repos if r['stargazers_count'] > 50]
-    created_dates = defaultdict(list)
-    for r in high_star_repos:
-        created_dates[r['created_at'][:10]].append(r['stargazers_count'])
+    # Accumulate [repo count, star sum] of high-star repos per creation date in one pass
+    created_dates = defaultdict(lambda: [0, 0])
+    for r in all_repos:
+        if r['stargazerCount'] > 50:
+            agg = created_dates[r['createdAt'][:10]]
+            agg[0] += 1
+            agg[1] += r['stargazerCount']
     
-    bulk_dates = {d: sum(s) for d, s in created_dates.items() if len(s) >= 2}
-    evidence_6_score = 25 if any(len(s) >= 3 for s in created_dates.values()) else (10 if bulk_dates else 0)
+    bulk_dates = {d: star_sum for d, (count, star_sum) in created_dates.items() if count >= 2}
+    evidence_6_score = 25 if any(count >= 3 for count, _ in created_dates.values()) else (10 if bulk_dates else 0)
     
     if evidence_6_score > 0:
         print(f"   ✓ Found {len(bulk_dates)} bulk dates")
@@ -502,13 +905,16 @@ def analyze_repository(owner, repo):
              "🟢 LOW SUSPICION"
     
     report = {
-        'analysis_date': datetime.now().isoformat(),
+        'analysis_date': run_ts.isoformat(),
         'repository': f"{owner}/{repo}",
         'metrics': {
             'stars': stars, 'forks': forks, 'fork_rate': fork_rate,
             'total_issues': total_issues, 'issue_rate': issue_rate,
             'total_prs': total_prs, 'pr_rate': pr_rate,
             'bot_commit_ratio': bot_ratio,
+            # None when --fast skipped the time analysis, so main_cluster is empty by design
+            'clustering_method': None if skip_clustering else clustering,
+            'clustering_skipped': skip_clustering,
             'main_cluster': main_cluster_info
         },
         'suspicion_score': total_score,
@@ -526,25 +932,109 @@ def analyze_repository(owner, repo):
     }
     
     output_file = f"report_{owner}_{repo}.json"
-    with open(output_file, 'w') as f:
-        json.dump(report, f, indent=2)
+    write_json(output_file, report)
     print(f"   ✓ Saved: {output_file}")
     
-    # Visualization
-    if intervals_min is not None and times is not None:
-        create_visualization(owner, repo, report, stargazers, intervals_min, times, clusters, max_clusters)
-    
-    # Verdict
-    generate_verdict(owner, repo, report)
+    # Visualization renders on a worker thread while the verdict is written
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        png_future = None
+        if intervals_min is not None and times is not None:
+            print(f"\n[7/8] Creating visualization...")
+            png_future = pool.submit(create_visualization, owner, repo, report, stargazers,
+                                     intervals_min, times, clusters, max_clusters)
+        
+        # Verdict
+        generate_verdict(owner, repo, report)
+        
+        if png_future is not None:
+            print(f"   ✓ Saved: {png_future.result()}")
     
     print(f"\n{'='*70}")
     print(f"📊 FINAL SCORE: {total_score}/200")
     print(f"STATUS: {status}")
     print('='*70)
+    return report
+
+def read_batch_file(path):
+    """Read owner/repo targets from a file, one per line (blank lines and # comments skipped)"""
+    targets = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if not line:
+                continue
+            owner, sep, repo = line.partition('/')
+            if not (sep and owner and repo) or '/' in repo:
+                raise ValueError(f"{path}: expected owner/repo, got {line!r}")
+            targets.append((owner, repo))
+    return targets
+
+def positive_int(value):
+    """argparse type for a count that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python3 final.py <owner> <repo>")
+    parser = argparse.ArgumentParser(description="Detect star manipulation on a GitHub repository")
+    parser.add_argument('owner', nargs='?', help="repository owner")
+    parser.add_argument('repo', nargs='?', help="repository name")
+    parser.add_argument('--batch', metavar='FILE',
+                        help="analyze every owner/repo listed in FILE (one per line) in one process")
+    parser.add_argument('--fast', action='store_true',
+                        help=f"skip time clustering and plotting when repository evidence "
+                             f"alone scores >= {FAST_PATH_SCORE}")
+    parser.add_argument('--clustering', choices=CLUSTERING_METHODS, default='ward',
+                        help="interval clustering method (default: ward)")
+    parser.add_argument('--max-stars', type=positive_int, default=MAX_STARGAZERS,
+                        help=f"stargazers to sample for time clustering (default: {MAX_STARGAZERS})")
+    parser.add_argument('--max-commits', type=positive_int, default=MAX_COMMITS,
+                        help=f"recent commits to scan for bot activity (default: {MAX_COMMITS})")
+    args = parser.parse_args()
+    
+    if args.batch:
+        if args.owner or args.repo:
+            parser.error("give either owner/repo or --batch FILE, not both")
+        try:
+            targets = read_batch_file(args.batch)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+    elif args.owner and args.repo:
+        targets = [(args.owner, args.repo)]
+    else:
+        parser.error("the following arguments are required: owner, repo (or --batch FILE)")
+    
+    if not TOKEN:
+        print("Error: GITHUB_TOKEN not found in .env file")
         sys.exit(1)
     
-    analyze_repository(sys.argv[1], sys.argv[2])
+    required_module = CLUSTERING_METHODS[args.clustering][1]
+    if required_module and importlib.util.find_spec(required_module) is None:
+        parser.error(f"--clustering {args.clustering} requires the '{required_module}' package")
+    
+    # One process for the whole batch: imports, the HTTP session and its cache are shared
+    failed = 0
+    for owner, repo in targets:
+        try:
+            analyze_repository(owner, repo, fast=args.fast, clustering=args.clustering,
+                               max_stars=args.max_stars, max_commits=args.max_commits)
+        except RepositoryNotFound as e:
+            print(f"❌ Error: {e}")
+            failed += 1
+        except RateLimitError as e:
+            # The quota is shared, so the remaining targets would fail as well
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+        except GitHubAPIError as e:
+            print(f"❌ Error: {e}")
+            if e.status == 401:
+                # A bad or revoked token fails every remaining target too
+                sys.exit(1)
+            failed += 1
+        except Exception as e:
+            # Network errors or unexpected API data only cost this one target
+            print(f"❌ Error analyzing {owner}/{repo}: {type(e).__name__}: {e}")
+            failed += 1
+    if failed:
+        sys.exit(1)